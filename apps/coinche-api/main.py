@@ -130,16 +130,17 @@ def get_game(game_id: str):
         raise HTTPException(status_code=404, detail="Game not found")
     match = games[game_id]
     
+    phase = match.phase_name() # Read once: each call crosses into Rust and allocates a str
     state = {
         "game_id": game_id,
-        "phase": match.phase_name(),
+        "phase": phase,
         "dealer": match.dealer,
         "coinche_level": match.coinche_level,
         "contract_owner": match.contract_owner,
         "hands": match.hands 
     }
     
-    if match.phase_name() == "BIDDING":
+    if phase == "BIDDING":
         bs = match.get_bidding_state()
         if bs:
             state["bidding"] = {
@@ -148,7 +149,7 @@ def get_game(game_id: str):
                 "contract": {"value": bs.contract.value, "trump": bs.contract.trump} if bs.contract else None,
                 "contract_owner": bs.contract_owner
             }
-    elif match.phase_name() == "PLAYING":
+    elif phase == "PLAYING":
         ps = match.get_playing_state()
         if ps:
             state["playing"] = {
@@ -166,7 +167,7 @@ def get_game(game_id: str):
         
         state["contract"] = {"value": match.contract.value, "trump": match.contract.trump} if match.contract else None
         
-    elif match.phase_name() == "FINISHED":
+    elif phase == "FINISHED":
         res = match.get_result()
         if res:
             state["result"] = {
@@ -209,6 +209,17 @@ impl CoincheMatch {
         }
     }
 
+    /// Integer phase code: 0=Bidding, 1=Playing, 2=Finished.
+    /// Cheaper than phase_name() for per-decision checks (no String allocation).
+    #[getter(phase)]
+    pub fn phase_code(&self) -> u8 {
+        match self.phase {
+            Phase::Bidding(_) => 0,
+            Phase::Playing(_) => 1,
+            Phase::Finished(_) => 2,
+        }
+    }
+
     pub fn get_bidding_state(&self) -> Option<BiddingState> {
         if let Phase::Bidding(ref s) = self.phase {
             Some(s.clone())
@@ -278,6 +289,7 @@ mod tests {
         m.bid(None).unwrap();
 
         // Should be playing now
+        assert_eq!(m.phase_code(), 1);
         match m.phase {
             Phase::Playing(ref g) => {
                 assert_eq!(g.trump, SPADES);
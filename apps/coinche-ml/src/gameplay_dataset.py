@@ -7,63 +7,94 @@ import numpy as np
 class GameplayDataset(Dataset):
     def __init__(self, parquet_file):
         df = pd.read_parquet(parquet_file)
-        
+
         # Filter out invalid entries (255 = No Move)
         initial_len = len(df)
         df = df[df['best_card'] != 255]
         filtered_len = len(df)
-        
+
         if initial_len != filtered_len:
             print(f"Filtered {initial_len - filtered_len} invalid samples (No Move). Remaining: {filtered_len}")
-            
+
         self.data = df.reset_index(drop=True)
-        
+
+        # Precompute the whole feature matrix once (vectorized) so samples can be
+        # served by plain indexing, or moved to the GPU in one go.
+        self.features = torch.from_numpy(self._build_features(self.data))
+        self.best_card = torch.from_numpy(self.data['best_card'].to_numpy(dtype=np.int64))
+        self.best_score = torch.from_numpy(self.data['best_score'].to_numpy(dtype=np.float32) / 162.0) # Normalize score
+
     def __len__(self):
         return len(self.data)
-    
+
     def __getitem__(self, idx):
-        row = self.data.iloc[idx]
-        
+        return {
+            'features': self.features[idx],
+            'best_card': self.best_card[idx],
+            'best_score': self.best_score[idx]
+        }
+
+    def _build_features(self, df):
+        n = len(df)
+
         # --- Feature Engineering ---
         # 1. Hand (32 bits) -> One-hot (32 floats)
-        hand = row['hand']
-        hand_vec = self._bits_to_vec(hand)
-        
+        hand_vec = self._bits_to_vec(df['hand'].to_numpy(dtype=np.int64))
+
         # 2. History (32 bits) -> One-hot (32 floats)
-        history = row['history']
-        history_vec = self._bits_to_vec(history)
-        
+        history_vec = self._bits_to_vec(df['history'].to_numpy(dtype=np.int64))
+
         # 3. Board (List of u8) -> One-hot (32 floats)
-        board = row['board']
-        board_vec = np.zeros(32, dtype=np.float32)
-        for card in board:
-            if card < 32:
-                board_vec[card] = 1.0
-                
+        board = df['board'].to_numpy()
+        lengths = np.fromiter((len(b) for b in board), dtype=np.int64, count=n)
+        board_vec = np.zeros((n, 32), dtype=np.float32)
+        if lengths.sum() > 0:
+            rows = np.repeat(np.arange(n), lengths)
+            cards = np.concatenate([np.asarray(b, dtype=np.int64) for b in board if len(b) > 0])
+            valid = cards < 32
+            board_vec[rows[valid], cards[valid]] = 1.0
+
         # 4. Trump (scalar) -> One-hot (4 floats, actually 0-5)
         # 0=Diamonds, 1=Spades, 2=Hearts, 3=Clubs, 4=NoTrump, 5=AllTrump
-        trump = row['trump']
-        trump_vec = np.zeros(6, dtype=np.float32) # Fixed: Size 6 for all trump types
-        if trump < 6:
-            trump_vec[trump] = 1.0
-            
+        trump = df['trump'].to_numpy(dtype=np.int64)
+        trump_vec = np.zeros((n, 6), dtype=np.float32) # Fixed: Size 6 for all trump types
+        valid = trump < 6
+        trump_vec[np.flatnonzero(valid), trump[valid]] = 1.0
+
         # Concatenate all features
         # 32 + 32 + 32 + 6 = 102
-        features = np.concatenate([hand_vec, history_vec, board_vec, trump_vec])
-        
-        # Targets
-        best_card = row['best_card']
-        best_score = row['best_score']
-        
-        return {
-            'features': torch.from_numpy(features),
-            'best_card': torch.tensor(best_card, dtype=torch.long),
-            'best_score': torch.tensor(best_score, dtype=torch.float32) / 162.0 # Normalize score
-        }
+        return np.concatenate([hand_vec, history_vec, board_vec, trump_vec], axis=1)
 
     def _bits_to_vec(self, bits):
-        vec = np.zeros(32, dtype=np.float32)
-        for i in range(32):
-            if (bits & (1 << i)) != 0:
-                vec[i] = 1.0
-        return vec
+        # (N,) ints -> (N, 32) float one-hot of the set bits
+        return ((bits[:, None] >> np.arange(32, dtype=np.int64)) & 1).astype(np.float32)
+
+class DeviceBatchLoader:
+    """
+    DataLoader replacement for datasets that fit in (GPU) memory.
+    Keeps the full tensors on `device` and yields batches by indexing a random
+    permutation each epoch - no workers, no collate, no per-batch H2D copies.
+    `indices` (a device tensor of row indices, e.g. a train/val split) restricts the
+    loader to those rows without copying them: loaders can share the same tensors.
+    """
+    def __init__(self, tensors, batch_size, shuffle=True, indices=None):
+        self.tensors = tensors # dict name -> tensor (all on the same device)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.device = next(iter(tensors.values())).device
+        if indices is None:
+            indices = torch.arange(len(next(iter(tensors.values()))), device=self.device)
+        self.indices = indices
+        self.num_samples = len(indices)
+
+    def __len__(self):
+        return (self.num_samples + self.batch_size - 1) // self.batch_size
+
+    def __iter__(self):
+        if self.shuffle:
+            order = self.indices[torch.randperm(self.num_samples, device=self.device)]
+        else:
+            order = self.indices
+        for i in range(0, self.num_samples, self.batch_size):
+            idx = order[i:i + self.batch_size]
+            yield {k: v[idx] for k, v in self.tensors.items()}
@@ -1,6 +1,6 @@
 
 import torch
-import torch.nn as nn
+import torch.nn.functional as F
 import torch.optim as optim
 from torch.utils.data import DataLoader, random_split
 import argparse
@@ -16,8 +16,7 @@ def bidding_step_fn(model, batch):
     
     outputs = model(inputs)
     
-    criterion = nn.MSELoss()
-    loss = criterion(outputs, targets)
+    loss = F.mse_loss(outputs, targets)
     
     return loss, {}
 
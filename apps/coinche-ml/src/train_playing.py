@@ -1,14 +1,13 @@
 
 print("Starting Gameplay Training...")
 import torch
-import torch.nn as nn
+import torch.nn.functional as F
 import torch.optim as optim
-from torch.utils.data import DataLoader, random_split
 import argparse
 import os
 
 from gameplay_model import GameplayResNet
-from gameplay_dataset import GameplayDataset
+from gameplay_dataset import GameplayDataset, DeviceBatchLoader
 from trainer import Trainer
 
 def playing_step_fn(model, batch):
@@ -18,11 +17,9 @@ def playing_step_fn(model, batch):
     
     pred_score, pred_policy = model(inputs)
     
-    mse_loss = nn.MSELoss()
-    ce_loss = nn.CrossEntropyLoss()
-    
-    loss_val = mse_loss(pred_score, target_score)
-    loss_pol = ce_loss(pred_policy, target_card)
+    # Functional losses: no loss-module construction per step
+    loss_val = F.mse_loss(pred_score, target_score)
+    loss_pol = F.cross_entropy(pred_policy, target_card)
     
     loss = loss_val + loss_pol
     
@@ -60,13 +57,20 @@ def train(parquet_file, output_path, epochs=10, batch_size=64, lr=0.001, dropout
     full_dataset = GameplayDataset(parquet_file)
     print(f"Total Dataset size: {len(full_dataset)}")
     
-    # Split Train/Val
+    # Keep the whole dataset resident on the device (102 floats/sample, a few hundred MB for 1M)
+    tensors = {
+        'features': full_dataset.features.to(device),
+        'best_card': full_dataset.best_card.to(device),
+        'best_score': full_dataset.best_score.to(device),
+    }
+    
+    # Split Train/Val: both loaders index the same device tensors (no per-split copies)
     train_size = int(0.8 * len(full_dataset))
-    val_size = len(full_dataset) - train_size
-    train_dataset, val_dataset = random_split(full_dataset, [train_size, val_size])
+    split = torch.randperm(len(full_dataset), device=device)
+    train_idx, val_idx = split[:train_size], split[train_size:]
     
-    train_loader = DataLoader(train_dataset, batch_size=batch_size, shuffle=True)
-    val_loader = DataLoader(val_dataset, batch_size=batch_size, shuffle=False)
+    train_loader = DeviceBatchLoader(tensors, batch_size=batch_size, shuffle=True, indices=train_idx)
+    val_loader = DeviceBatchLoader(tensors, batch_size=batch_size, shuffle=False, indices=val_idx)
 
     # Initialize Model
     model = GameplayResNet(input_dim=102, dropout_rate=dropout_rate, num_blocks=num_blocks).to(device)
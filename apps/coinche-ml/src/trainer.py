@@ -6,6 +6,7 @@ from torch.utils.tensorboard import SummaryWriter
 from tqdm import tqdm
 import numpy as np
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 class Trainer:
@@ -25,8 +26,42 @@ class Trainer:
             current_time = datetime.now().strftime('%b%d_%H-%M-%S')
             log_dir = os.path.join(log_dir, current_time)
             
-        self.writer = SummaryWriter(log_dir=log_dir)
+        self.writer = SummaryWriter(log_dir=log_dir, flush_secs=60)
         print(f"TensorBoard logging to {log_dir}")
+
+        # Scalars are buffered per epoch and written by a background thread
+        # so TensorBoard I/O never stalls the training step.
+        self._pending = []
+        self._log_executor = ThreadPoolExecutor(max_workers=1)
+
+        # Checkpoints are pickled/written by a background thread (see _save_checkpoint)
+        self._saver = ThreadPoolExecutor(max_workers=1)
+        self._pending_save = None
+        
+    def _log_scalar(self, tag, value, step):
+        self._pending.append((tag, value, step))
+
+    def _flush_scalars(self):
+        if not self._pending:
+            return
+        items, self._pending = self._pending, []
+        self._log_executor.submit(lambda items: [self.writer.add_scalar(*it) for it in items], items)
+
+    def _save_checkpoint(self, checkpoint_path):
+        # Only rank 0 writes checkpoints (no-op guard when not running distributed)
+        if torch.distributed.is_available() and torch.distributed.is_initialized() and torch.distributed.get_rank() != 0:
+            return
+        # Snapshot on the main thread (copy=True so later optimizer steps can't alter it),
+        # then serialize + write in the background.
+        state = {k: v.detach().to('cpu', copy=True) for k, v in self.model.state_dict().items()}
+        self._wait_checkpoint()
+        self._pending_save = self._saver.submit(torch.save, state, checkpoint_path)
+
+    def _wait_checkpoint(self):
+        # Blocks on the last background save and re-raises its error (missing dir, full disk...)
+        if self._pending_save is not None:
+            pending, self._pending_save = self._pending_save, None
+            pending.result()
         
     def train(self, epochs, loss_fn_dict, 
               eval_fn=None, # Function to compute custom metrics (e.g. MAE)
@@ -71,8 +106,8 @@ class Trainer:
                 train_loss += loss.item()
                 current_step = epoch * len(self.train_loader) + progress_bar.n
                 if current_step % 100 == 0:
-                    self.writer.add_scalar('Train/Batch_Loss', loss.item(), current_step)
-                    self.writer.add_scalar('Train/Grad_Norm', total_norm, current_step)
+                    self._log_scalar('Train/Batch_Loss', loss.item(), current_step)
+                    self._log_scalar('Train/Grad_Norm', total_norm, current_step)
                 
                 # Update progress bar
                 desc = {'loss': f"{loss.item():.4f}"}
@@ -91,11 +126,13 @@ class Trainer:
                 'Validation': val_loss
             }, epoch)
             
-            self.writer.add_scalar('Generalization Gap', abs(avg_train_loss - val_loss), epoch)
-            self.writer.add_scalar('Gradient Norm', total_norm, epoch) # Log last batch grad norm
+            self._log_scalar('Generalization Gap', abs(avg_train_loss - val_loss), epoch)
+            self._log_scalar('Gradient Norm', total_norm, epoch) # Log last batch grad norm
             
             for k, v in val_metrics.items():
-                self.writer.add_scalar(f'Validation/{k}', v, epoch)
+                self._log_scalar(f'Validation/{k}', v, epoch)
+
+            self._flush_scalars()
             
             print(f"Epoch {epoch+1} | Train Loss: {avg_train_loss:.4f} | Val Loss: {val_loss:.4f}")
             
@@ -104,7 +141,7 @@ class Trainer:
                 min_val_loss = val_loss
                 no_improve_epochs = 0
                 best_epoch = epoch + 1
-                torch.save(self.model.state_dict(), checkpoint_path)
+                self._save_checkpoint(checkpoint_path)
                 print(f"  -> Validation loss improved. Saved model to {checkpoint_path}")
             else:
                 no_improve_epochs += 1
@@ -136,6 +173,11 @@ class Trainer:
             
         self.writer.add_text('Final_Summary', final_text, epoch)
         
+        # Drain pending background writes before closing the writer
+        self._flush_scalars()
+        self._log_executor.shutdown(wait=True)
+        self._wait_checkpoint()
+        self._saver.shutdown(wait=True)
         self.writer.flush()
         self.writer.close()
         
@@ -3,8 +3,10 @@ import torch
 import numpy as np
 import sys
 import os
-import random
-from abc import ABC, abstractmethod
+import io
+
+# Torch-free agents and rules live in baseline_agents; re-exported so agent.* keeps working
+from baseline_agents import BaseAgent, RandomAgent, HeuristicAgent, decide_bid, heuristic_bid, heuristic_card
 
 # Allow importing from coinche-ml src
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../coinche-ml/src")))
@@ -15,28 +17,34 @@ try:
 except ImportError:
     pass # Might not be needed for Heuristic/Random
 
-class BaseAgent(ABC):
-    def __init__(self, name):
-        self.name = name
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None # Optional: only needed for use_onnx=True
 
-    @abstractmethod
-    def get_bid(self, hand_int, current_contract=None, partner_contract=None):
-        """
-        Returns (suit_idx, est_score)
-        """
-        pass
-
-    @abstractmethod
-    def get_card(self, hand_int, history_int, board_cards, is_trump, legal_mask):
-        """
-        Returns best card (0-31)
-        """
-        pass
+# _LUT[byte] -> its 8 bits as floats. A 32-bit mask is 4 byte lookups (one fancy-index for a batch).
+_LUT = ((np.arange(256)[:, None] >> np.arange(8)) & 1).astype(np.float32)
+_BYTE_SHIFTS = np.array([0, 8, 16, 24], dtype=np.int64)
+
+def _masks_to_matrix(masks):
+    # (B,) 32-bit card masks -> (B, 32) float32 one-hot
+    m = np.asarray(masks, dtype=np.int64)
+    return _LUT[(m[:, None] >> _BYTE_SHIFTS) & 0xFF].reshape(len(m), 32)
+
+def _masks_into(out, masks):
+    # Same as _masks_to_matrix, written into `out` (a (B, 32) float32 view, e.g. columns of a feature buffer)
+    m = np.asarray(masks, dtype=np.int64)
+    np.take(_LUT, (m[:, None] >> _BYTE_SHIFTS) & 0xFF, axis=0, out=out.reshape(len(m), 4, 8), mode='clip')
 
 class AI_Agent(BaseAgent):
-    def __init__(self, bidding_model_path, playing_model_path, device, name="AI"):
+    deterministic = True # Greedy argmax over the model outputs
+
+    def __init__(self, bidding_model_path, playing_model_path, device, name="AI", use_onnx=False, quantize=False, jit=False, compile=False):
         super().__init__(name)
         self.device = device
+        if use_onnx and quantize:
+            # The ONNX session is exported from the FP32 playing model: cards would silently be played unquantized
+            raise ValueError("use_onnx and quantize can't be combined (the ONNX playing model is FP32)")
         
         # Load Bidding Model
         self.bidding_model = BiddingValueNet().to(device)
@@ -53,166 +61,229 @@ class AI_Agent(BaseAgent):
             raise
         self.playing_model.eval()
 
-    def get_bid(self, hand_int, current_contract=None, partner_contract=None):
-        # Feature Engineering: 32-bit hand to One Hot
-        hand_vec = np.zeros(32, dtype=np.float32)
-        for i in range(32):
-            if (hand_int & (1 << i)) != 0:
-                hand_vec[i] = 1.0
-        
-        input_tensor = torch.from_numpy(hand_vec).unsqueeze(0).to(self.device)
-        
-        with torch.no_grad():
-            output_scores = self.bidding_model(input_tensor)
-            raw_scores = output_scores * 162.0
-            
-        best_suit_idx = torch.argmax(raw_scores).item()
-        best_score = raw_scores[0, best_suit_idx].item()
-        
-        return best_suit_idx, best_score
+        # Bit i of a card mask -> card i. Used to turn legal_mask into a bool tensor in one op.
+        self._bit_mask = torch.tensor([1 << i for i in range(32)], dtype=torch.int64, device=device)
 
-    def get_card(self, hand_int, history_int, board_cards, trump_val, legal_mask):
-        # Feature Engineering
-        hand_vec = np.zeros(32, dtype=np.float32)
-        for i in range(32):
-            if (hand_int & (1 << i)) != 0:
-                hand_vec[i] = 1.0
+        # Dedicated CUDA stream so inference overlaps with engine-side Python work
+        self._stream = torch.cuda.Stream() if torch.device(device).type == 'cuda' else None
         
-        history_vec = np.zeros(32, dtype=np.float32)
-        for i in range(32):
-            if (history_int & (1 << i)) != 0:
-                history_vec[i] = 1.0
-                
-        board_vec = np.zeros(32, dtype=np.float32)
-        for card in board_cards:
-            if card < 32:
-                board_vec[card] = 1.0
-                
-        trump_vec = np.zeros(6, dtype=np.float32)
-        if trump_val < 6:
-            trump_vec[trump_val] = 1.0
-            
-        features = np.concatenate([hand_vec, history_vec, board_vec, trump_vec])
-        input_tensor = torch.from_numpy(features).unsqueeze(0).to(self.device)
-        
-        with torch.no_grad():
-            _, policy_logits = self.playing_model(input_tensor)
-            
-        masked_logits = policy_logits.squeeze(0).clone()
-        for i in range(32):
-            if (legal_mask & (1 << i)) == 0:
-                masked_logits[i] = -float('inf')
-                
-        best_card = torch.argmax(masked_logits).item()
-        return best_card
-
-class RandomAgent(BaseAgent):
-    def __init__(self, name="Random"):
-        super().__init__(name)
+        # CUDA only: pinned host staging buffers (async H2D) and captured CUDA graphs per batch size
+        self._host_bufs = {} # name -> (N, width) host tensor (pinned on CUDA), grown on demand
+        self._graphs = {} # (id(model), padded batch) -> (graph, static_in, static_out)
+
+        # Optional ONNX Runtime session for the playing model (no Python dispatch per layer at BS=1)
+        self._ort = None
+        if use_onnx:
+            self._ort = self._export_onnx(self.playing_model, input_dim=102)
+
+        # Dynamic INT8 quantization of the Linear layers (CPU only, fbgemm kernels)
+        if quantize:
+            if torch.device(device).type != 'cpu':
+                print("Warning: INT8 dynamic quantization is CPU-only. Skipping.")
+            else:
+                self.bidding_model = torch.quantization.quantize_dynamic(self.bidding_model, {torch.nn.Linear}, dtype=torch.qint8)
+                self.playing_model = torch.quantization.quantize_dynamic(self.playing_model, {torch.nn.Linear}, dtype=torch.qint8)
+
+        # TorchScript + freeze: BatchNorm folded into Linear, Dropout dropped, no per-module Python dispatch
+        if jit:
+            self.bidding_model = self._script(self.bidding_model)
+            self.playing_model = self._script(self.playing_model)
+
+        # torch.compile (kernel fusion; CUDA graphs via reduce-overhead on GPU). Compiled once here,
+        # warmed up on the batch sizes the tournament scheduler produces.
+        self._compiled = False
+        if compile and not jit:
+            try:
+                self.bidding_model = torch.compile(self.bidding_model, mode='reduce-overhead', dynamic=True)
+                self.playing_model = torch.compile(self.playing_model, mode='reduce-overhead', dynamic=True)
+                self._compiled = True
+                self._warmup_compile()
+            except Exception as e:
+                print(f"Warning: torch.compile failed ({e}). Using eager models.")
+                self.bidding_model = getattr(self.bidding_model, '_orig_mod', self.bidding_model)
+                self.playing_model = getattr(self.playing_model, '_orig_mod', self.playing_model)
+                self._compiled = False
+
+    def _warmup_compile(self, max_batch=64):
+        with torch.inference_mode():
+            batch = 1
+            while batch <= max_batch:
+                self.bidding_model(torch.zeros(batch, 32, device=self.device))
+                self.playing_model(torch.zeros(batch, 102, device=self.device))
+                batch *= 2
+
+    def _host_buffer(self, name, n, width, dtype=torch.float32):
+        # Reused (n, width) host tensor, filled in place by the caller. Pinned on CUDA so the H2D copy
+        # is async; results are collected before the next submit, so the buffer is free again by then.
+        buf = self._host_bufs.get(name)
+        if buf is None or buf.shape[0] < n:
+            buf = torch.empty((max(n, 64), width), dtype=dtype, pin_memory=self._stream is not None)
+            self._host_bufs[name] = buf
+        return buf[:n]
+
+    def _send(self, host):
+        return host if self._stream is None else host.to(self.device, non_blocking=True)
+
+    def _to_device(self, array, name):
+        # (B, W) numpy array -> device tensor (staged through a reused pinned buffer on CUDA)
+        if self._stream is None:
+            return torch.from_numpy(array)
+        host = self._host_buffer(name, len(array), array.shape[1], torch.from_numpy(array).dtype)
+        host.numpy()[:] = array
+        return self._send(host)
+
+    def _forward(self, model, x):
+        if self._stream is None or self._compiled: # torch.compile manages its own CUDA graphs
+            return model(x)
+        # CUDA: replay a graph captured for the batch size rounded up to a power of two
+        # (eval-mode nets are row-independent, so padding rows don't affect the real ones)
+        n = x.shape[0]
+        size = 1 << (n - 1).bit_length()
+        key = (id(model), size)
+        entry = self._graphs.get(key)
+        if entry is None:
+            static_in = torch.zeros((size, x.shape[1]), device=self.device)
+            for _ in range(3): # Warmup (cuBLAS handles, allocator) before capture
+                model(static_in)
+            graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(graph, stream=self._stream):
+                static_out = model(static_in)
+            entry = self._graphs[key] = (graph, static_in, static_out)
+        graph, static_in, static_out = entry
+        static_in[:n].copy_(x)
+        graph.replay()
+        if isinstance(static_out, tuple):
+            return tuple(out[:n] for out in static_out)
+        return static_out[:n]
+
+    def _script(self, model):
+        try:
+            return torch.jit.optimize_for_inference(torch.jit.script(model.eval()))
+        except Exception as e:
+            print(f"Warning: Could not script {type(model).__name__} ({e}). Keeping eager module.")
+            return model
+
+    def _export_onnx(self, model, input_dim):
+        if onnxruntime is None:
+            print("Warning: onnxruntime not installed. Falling back to PyTorch eager inference.")
+            return None
+        # Exported in memory: nothing left on disk, whatever the number of agents / worker processes
+        onnx_model = io.BytesIO()
+        torch.onnx.export(model, torch.zeros(1, input_dim, device=self.device), onnx_model,
+                          opset_version=17, input_names=['x'], output_names=['value', 'policy'],
+                          dynamic_axes={'x': {0: 'B'}})
+        providers = ['CUDAExecutionProvider', 'CPUExecutionProvider'] if torch.device(self.device).type == 'cuda' else ['CPUExecutionProvider']
+        return onnxruntime.InferenceSession(onnx_model.getvalue(), providers=providers)
 
     def get_bid(self, hand_int, current_contract=None, partner_contract=None):
-        # Random suit, random score between 80-160? 
-        # Or just PASS mostly?
-        # Let's say it evaluates random potential.
-        return random.randint(0, 3), random.uniform(70, 100)
+        return self.get_bid_batch([(hand_int,)])[0]
 
     def get_card(self, hand_int, history_int, board_cards, trump_val, legal_mask):
-        legal_moves = []
-        for i in range(32):
-            if (legal_mask & (1 << i)) != 0:
-                legal_moves.append(i)
-        return random.choice(legal_moves)
-
-class HeuristicAgent(BaseAgent):
-    def __init__(self, name="Heuristic"):
-        super().__init__(name)
+        return self.get_card_batch([(hand_int, history_int, board_cards, trump_val, legal_mask)])[0]
 
-    def get_bid(self, hand_int, current_contract=None, partner_contract=None):
-        # Count points (Belote standard)
-        # Jacks=20, 9s=14, Aces=11, 10s=10, K=4, Q=3
-        # Estimate points in hand + some helper
-        # Logic: Pick best suit based on point density.
+    def get_bid_batch(self, queries):
+        return self.submit_bid_batch(queries)()
+
+    def get_bid_action_batch(self, queries):
+        return self.submit_bid_action_batch(queries)()
+
+    def get_card_batch(self, queries):
+        return self.submit_card_batch(queries)()
+
+    def _readback(self, tensor):
+        # Device -> host copy queued on self._stream. Returns a callable that waits for it
+        # and converts to a list. Staging buffers are reused on the next submit, so callers
+        # must collect before submitting to the same agent again.
+        if self._stream is None:
+            return tensor.tolist
+        host = tensor.to('cpu', non_blocking=True)
+        done = torch.cuda.Event()
+        done.record(self._stream)
+        def collect():
+            done.synchronize()
+            return host.tolist()
+        return collect
+
+    def submit_bid_batch(self, queries):
+        # Feature Engineering: 32-bit hand to One Hot, (B, 32), written into the reused input buffer
+        host = self._host_buffer('hand', len(queries), 32)
+        _masks_into(host.numpy(), [q[0] for q in queries])
         
-        best_suit = 0
-        max_points = 0
+        with torch.inference_mode(), torch.cuda.stream(self._stream):
+            input_tensor = self._send(host)
+            output = self._forward(self.bidding_model, input_tensor)
+
+            # Scaling by 162 is monotonic: argmax on the raw output, denormalize on CPU
+            best_scores, best_suits = output.max(dim=1)
+            best = self._readback(torch.stack((best_suits.to(best_scores.dtype), best_scores), dim=1)) # One D2H transfer
+
+        return lambda: [(int(suit), score * 162.0) for suit, score in best()]
+
+    def submit_bid_action_batch(self, queries):
+        # decide_bid applied on device right after the forward: one int64 action code per row
+        n = len(queries)
+        host = self._host_buffer('hand', n, 32)
+        _masks_into(host.numpy(), [q[0] for q in queries])
+        context = self._host_buffer('bid_context', n, 3, torch.int64)
+        context.numpy()[:] = [q[1:] for q in queries]
         
-        # Iterate suits 0-3
-        for suit in range(4):
-            points = 0
-            # Cards in suit: offset 8*suit.
-            # Ranks: 7,8,9,10,J,Q,K,A
-            # Values (Trump): 0,0,14,10,20,3,4,11
-            # Values (NoTrump): 0,0,0,10,2,3,4,11
-            # Check cards in hand_int
-            
-            # Simple point counter for validation
-            # J(4)=20, 9(2)=14, A(7)=11, 10(3)=10, K(6)=4, Q(5)=3
-            has_valet = (hand_int & (1 << (suit*8 + 4))) != 0
-            has_neuf = (hand_int & (1 << (suit*8 + 2))) != 0
-            has_as = (hand_int & (1 << (suit*8 + 7))) != 0
+        with torch.inference_mode(), torch.cuda.stream(self._stream):
+            output = self._forward(self.bidding_model, self._send(host))
+            best_scores, best_suits = output.max(dim=1)
+            contract_value, contract_owner, current_player = self._send(context).unbind(1)
             
-            if has_valet: points += 20
-            if has_neuf: points += 14
-            if has_as: points += 11
-            
-            # Add length bonus
-            count = 0
-            for r in range(8):
-                if (hand_int & (1 << (suit*8 + r))) != 0:
-                    count += 1
-            points += count * 10
-            
-            if points > max_points:
-                max_points = points
-                best_suit = suit
-        
-        # Expected score ~= points + partner help (20?)
-        return best_suit, max_points + 20
+            # Same arithmetic as decide_bid (float64, round half to even), capped at 160
+            bid_val = (torch.round(best_scores.double() * 162.0 / 10.0) * 10).long().clamp(max=160)
+            min_bid_val = torch.where(contract_value > 0, contract_value + 10, 80)
+            partner_owns = (contract_owner >= 0) & (contract_owner % 2 == current_player % 2)
+            valid = (bid_val >= min_bid_val) & ~(partner_owns & (bid_val <= min_bid_val + 10))
+            actions = self._readback(torch.where(valid, bid_val * 10 + best_suits, -1))
+        return actions
 
-    def get_card(self, hand_int, history_int, board_cards, trump_val, legal_mask):
-        # Deterministic Rules
-        # 1. If partner controls trick and I don't need to cut -> Play small score (dump trash) or points (if safe)?
-        # 2. If valid to cut, do I?
-        # Simple Heuristic: Play Highest Legal Card (Power)
-        
-        legal_cards = []
-        for i in range(32):
-            if (legal_mask & (1 << i)) != 0:
-                legal_cards.append(i)
-        
-        # Rank is (card % 8). 
-        # Standard Order: 7(0) < 8(1) < 9(2) < 10(3) < J(4) < Q(5) < K(6) < A(7)
-        # Trump Order: 7 < 8 < Q < K < 10 < A < 9 < J
-        
-        best_card = legal_cards[0]
-        max_power = -1
+    def submit_card_batch(self, queries):
+        # Feature Engineering, (B, 102) = [hand 32 | history 32 | board 32 | trump 6],
+        # filled in place in the reused input buffer (no per-call concatenate)
+        n = len(queries)
+        host = self._host_buffer('features', n, 102)
+        features = host.numpy()
+        _masks_into(features[:, 0:32], [q[0] for q in queries])
+        _masks_into(features[:, 32:64], [q[1] for q in queries])
         
-        for c in legal_cards:
-            suit = c // 8
-            rank = c % 8
-            is_trump_card = (suit == trump_val) or (trump_val == 5) # AllTrump=5
+        features[:, 64:] = 0.0
+        board_vec = features[:, 64:96]
+        trump_vec = features[:, 96:102]
+        for b, (_, _, board_cards, trump_val, _) in enumerate(queries):
+            for card in board_cards:
+                if card < 32:
+                    board_vec[b, card] = 1.0
+            if trump_val < 6:
+                trump_vec[b, trump_val] = 1.0
             
-            # Simplified Power
-            if is_trump_card:
-                # J=7, 9=6, A=5, 10=4, K=3, Q=2, 8=1, 7=0
-                power_map = {4:7, 2:6, 7:5, 3:4, 6:3, 5:2, 1:1, 0:0}
-                power = 100 + power_map.get(rank, 0)
-            else:
-                # A=7, 10=6, K=5, Q=4, J=3, 9=2, 8=1, 7=0
-                power_map = {7:7, 3:6, 6:5, 5:4, 4:3, 2:2, 1:1, 0:0}
-                power = power_map.get(rank, 0)
-            
-            if power > max_power:
-                max_power = power
-                best_card = c
-                
-        return best_card
+        legal_masks = [q[4] for q in queries]
+
+        if self._ort is not None:
+            policy_logits = self._ort.run(None, {'x': features})[1]
+            illegal = _masks_to_matrix(legal_masks) == 0
+            return np.where(illegal, -np.inf, policy_logits).argmax(axis=1).tolist
+
+        # Everything (H2D copy, forward, readback) stays on self._stream to avoid cross-stream races
+        with torch.inference_mode(), torch.cuda.stream(self._stream):
+            input_tensor = self._send(host)
+            _, policy_logits = self._forward(self.playing_model, input_tensor)
+
+            # Mask illegal cards in a single op (instead of 32 scalar writes per row)
+            legal = self._to_device(np.array(legal_masks, dtype=np.int64).reshape(-1, 1), 'legal').view(-1)
+            illegal = (legal.unsqueeze(1) & self._bit_mask) == 0
+            masked_logits = policy_logits.masked_fill(illegal, float('-inf'))
+
+            best_cards = self._readback(torch.argmax(masked_logits, dim=1))
+        return best_cards
 
-def load_agent(bidding_path, playing_path, device, name):
+def load_agent(bidding_path, playing_path, device, name, use_onnx=False, quantize=False, jit=False, compile=False):
     # If paths are 'heuristic' or 'random'
     if bidding_path.lower() == 'heuristic':
         return HeuristicAgent(name)
     elif bidding_path.lower() == 'random':
         return RandomAgent(name)
     else:
-        return AI_Agent(bidding_path, playing_path, device, name)
+        return AI_Agent(bidding_path, playing_path, device, name, use_onnx=use_onnx, quantize=quantize, jit=jit, compile=compile)
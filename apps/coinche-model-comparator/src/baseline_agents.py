@@ -0,0 +1,205 @@
+
+# Torch-free agents: BaseAgent, the heuristic / random baselines and the bid rules (decide_bid).
+# Kept out of agent.py so the tournament and heuristic-only runs don't import torch.
+import random
+from abc import ABC, abstractmethod
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None # Optional ('jit' extra): decide_bid stays pure Python without it
+
+# Per-suit bitmasks (card = suit*8 + rank, ranks: 7,8,9,10,J,Q,K,A)
+_SUIT_MASKS = [0xFF << (8 * s) for s in range(4)]
+_J_MASKS = [1 << (8 * s + 4) for s in range(4)]
+_N_MASKS = [1 << (8 * s + 2) for s in range(4)]
+_A_MASKS = [1 << (8 * s + 7) for s in range(4)]
+
+# _BYTE_CARDS[k][v] -> cards set in byte k (value v) of a 32-bit mask, offsets already applied
+_BYTE_BITS = [[b for b in range(8) if (v >> b) & 1] for v in range(256)]
+_BYTE_CARDS = [[[b + 8 * k for b in bits] for bits in _BYTE_BITS] for k in range(4)]
+
+def _mask_to_cards(mask):
+    return (_BYTE_CARDS[0][mask & 0xFF] + _BYTE_CARDS[1][(mask >> 8) & 0xFF]
+            + _BYTE_CARDS[2][(mask >> 16) & 0xFF] + _BYTE_CARDS[3][(mask >> 24) & 0xFF])
+
+def _build_power_table():
+    # _POWER[trump_val][card] -> simplified card power (trumps always beat non-trumps).
+    # Plain lists: heuristic_card looks up a handful of legal cards per call, where NumPy's call overhead dominates.
+    # Trump: J=7, 9=6, A=5, 10=4, K=3, Q=2, 8=1, 7=0 (+100)
+    # Non-Trump: A=7, 10=6, K=5, Q=4, J=3, 9=2, 8=1, 7=0
+    trump_power = [0, 1, 6, 4, 7, 2, 3, 5]
+    plain_power = [0, 1, 2, 6, 3, 4, 5, 7]
+    power = [[0] * 32 for _ in range(6)]
+    for trump_val in range(6):
+        for c in range(32):
+            suit, rank = c // 8, c % 8
+            if suit == trump_val or trump_val == 5: # AllTrump=5
+                power[trump_val][c] = 100 + trump_power[rank]
+            else:
+                power[trump_val][c] = plain_power[rank]
+    return power
+
+_POWER = _build_power_table()
+
+def decide_bid(est_score, suit_idx, contract_value, contract_owner, current_player):
+    """
+    Bid decision for one turn, from the agent's (suit_idx, est_score).
+    contract_value is 0 and contract_owner -1 while there is no contract.
+    Returns bid_val * 10 + suit_idx, or -1 to pass.
+    """
+    # Rules: 
+    # - Must bid higher than current contract (min 80).
+    # - increments of 10.
+    min_bid_val = 80
+    if contract_value > 0:
+        min_bid_val = contract_value + 10
+    
+    # Round est_score to nearest 10
+    bid_val = int(round(est_score / 10.0)) * 10
+    
+    # Cap at 160 (or 180?)
+    if bid_val > 160:
+        bid_val = 160
+    
+    # Check legality
+    if bid_val < min_bid_val:
+        return -1
+    
+    # Greedy: if my hand value beats the current contract, I bid.
+    # Except over my partner's contract: only raise if my bid is significantly higher.
+    if contract_owner >= 0 and (contract_owner % 2) == (current_player % 2) and bid_val <= min_bid_val + 10:
+        return -1
+    
+    return bid_val * 10 + suit_idx
+
+if njit is not None:
+    decide_bid = njit(cache=True)(decide_bid)
+
+class BaseAgent(ABC):
+    # Same state -> same decision. Lets the tournament skip mirrored duplicate games.
+    # Opt-in: subclasses set it only when their policy has no randomness.
+    deterministic = False
+
+    def __init__(self, name):
+        self.name = name
+
+    @abstractmethod
+    def get_bid(self, hand_int, current_contract=None, partner_contract=None):
+        """
+        Returns (suit_idx, est_score)
+        """
+        pass
+
+    @abstractmethod
+    def get_card(self, hand_int, history_int, board_cards, is_trump, legal_mask):
+        """
+        Returns best card (0-31)
+        """
+        pass
+
+    def get_bid_batch(self, queries):
+        """
+        queries: list of get_bid argument tuples. Returns list of (suit_idx, est_score).
+        Agents backed by a network override this to run a single forward pass.
+        """
+        return [self.get_bid(*q) for q in queries]
+
+    def get_card_batch(self, queries):
+        """
+        queries: list of get_card argument tuples. Returns list of cards (0-31).
+        """
+        return [self.get_card(*q) for q in queries]
+
+    def get_bid_action_batch(self, queries):
+        """
+        queries: list of (hand_int, contract_value, contract_owner, current_player) tuples
+        (contract_value 0 / contract_owner -1 while there is no contract).
+        Returns list of action codes: bid_val * 10 + suit_idx, or -1 to pass (see decide_bid).
+        """
+        estimates = self.get_bid_batch([(q[0],) for q in queries])
+        return [decide_bid(est_score, suit_idx, *q[1:]) for (suit_idx, est_score), q in zip(estimates, queries)]
+
+    def submit_bid_action_batch(self, queries):
+        """
+        Starts get_bid_action_batch(queries) and returns a zero-argument callable producing its
+        answers. GPU agents queue the work on their own CUDA stream and only wait when the
+        callable is invoked, so the forwards of different agents can overlap.
+        """
+        answers = self.get_bid_action_batch(queries)
+        return lambda: answers
+
+    def submit_card_batch(self, queries):
+        """
+        Same as submit_bid_action_batch, for get_card_batch.
+        """
+        answers = self.get_card_batch(queries)
+        return lambda: answers
+
+class RandomAgent(BaseAgent):
+    def __init__(self, name="Random"):
+        super().__init__(name)
+
+    def get_bid(self, hand_int, current_contract=None, partner_contract=None):
+        # Random suit, random score between 80-160? 
+        # Or just PASS mostly?
+        # Let's say it evaluates random potential.
+        return random.randint(0, 3), random.uniform(70, 100)
+
+    def get_card(self, hand_int, history_int, board_cards, trump_val, legal_mask):
+        legal_moves = _mask_to_cards(legal_mask)
+        return random.choice(legal_moves)
+
+def heuristic_bid(hand_int):
+    """
+    HeuristicAgent bidding policy. Returns (suit_idx, est_score).
+    Module-level so specialized game loops can call it without agent dispatch.
+    """
+    # Count points (Belote standard)
+    # Jacks=20, 9s=14, Aces=11, 10s=10, K=4, Q=3
+    # Estimate points in hand + some helper
+    # Logic: Pick best suit based on point density.
+    
+    best_suit = 0
+    max_points = 0
+    
+    # Iterate suits 0-3
+    for suit in range(4):
+        # Simple point counter for validation
+        # J(4)=20, 9(2)=14, A(7)=11 + length bonus (10 per card in suit)
+        points = (20 * bool(hand_int & _J_MASKS[suit])
+                  + 14 * bool(hand_int & _N_MASKS[suit])
+                  + 11 * bool(hand_int & _A_MASKS[suit])
+                  + 10 * (hand_int & _SUIT_MASKS[suit]).bit_count())
+
+        if points > max_points:
+            max_points = points
+            best_suit = suit
+    
+    # Expected score ~= points + partner help (20?)
+    return best_suit, max_points + 20
+
+def heuristic_card(legal_mask, trump_val):
+    """
+    HeuristicAgent playing policy. Returns best card (0-31).
+    """
+    # Deterministic Rules
+    # 1. If partner controls trick and I don't need to cut -> Play small score (dump trash) or points (if safe)?
+    # 2. If valid to cut, do I?
+    # Simple Heuristic: Play Highest Legal Card (Power)
+    
+    # Power lookup (see _build_power_table). Cards come in ascending order and max keeps
+    # the first maximum, so ties go to the lowest card.
+    return max(_mask_to_cards(legal_mask), key=_POWER[trump_val].__getitem__)
+
+class HeuristicAgent(BaseAgent):
+    deterministic = True
+
+    def __init__(self, name="Heuristic"):
+        super().__init__(name)
+
+    def get_bid(self, hand_int, current_contract=None, partner_contract=None):
+        return heuristic_bid(hand_int)
+
+    def get_card(self, hand_int, history_int, board_cards, trump_val, legal_mask):
+        return heuristic_card(legal_mask, trump_val)
@@ -9,7 +9,16 @@ import time
 
 import agent
 from agent import load_agent
-from tournament import TournamentEngine, Team
+from tournament import TournamentEngine, Team, same_agent_spec, TEAM_A, TEAM_B, BID_TAKEN, BID_MADE, BID_VALUE, DEF_SCORE, DEF_COUNT, WINS
+
+def _quantized_agreement(agent_q, spec, n_hands=100, seed=0):
+    """
+    Fraction of decisions where a quantized AI agent matches its FP32 reference
+    (a plain AI_Agent on the same models) over n_hands reference self-play games.
+    """
+    ref = agent.AI_Agent(spec['bidding_path'], spec['playing_path'], spec['device'], name='FP32_Reference')
+    engine = TournamentEngine(Team('ref', ref), Team('ref', ref))
+    return engine.decision_agreement(agent_q, n_hands, seed)
 
 def main():
     parser = argparse.ArgumentParser(description="Coinche Model Comparator (Duplicate Tournament)")
@@ -26,27 +35,62 @@ def main():
     
     # Tournament Settings
     parser.add_argument("--nb_games", type=int, default=1000, help="Number of duplicate hands to play")
-    parser.add_argument("--device", type=str, default="cpu", help="Device (cpu/cuda)")
+    parser.add_argument("--device", type=str, default="cpu", help="Device (cpu/cuda). cuda is only worth it with --batch_hands > 1")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes for the tournament (CPU only, 1 = serial)")
+    parser.add_argument("--seed", type=int, default=None, help="Tournament seed (deals are reproducible for a given seed and --batch_hands)")
+    parser.add_argument("--batch_hands", type=int, default=32, help="Hands played concurrently so agent queries can be batched (1 = no batching)")
     parser.add_argument("--log_dir", type=str, default="runs/tournament", help="TensorBoard log dir")
+    parser.add_argument("--onnx", action="store_true", help="Run AI playing models through ONNX Runtime (requires onnxruntime)")
+    parser.add_argument("--quantize", action="store_true", help="INT8 dynamic quantization of AI models (CPU only)")
+    parser.add_argument("--jit", action="store_true", help="TorchScript + optimize_for_inference for AI models")
+    parser.add_argument("--compile", action="store_true", help="torch.compile AI models (ignored with --jit)")
     
     args = parser.parse_args()
+    if args.onnx and args.quantize:
+        parser.error("--onnx and --quantize can't be combined: the ONNX playing model is exported in FP32")
     
     device = torch.device(args.device)
+    if device.type == 'cuda' and args.batch_hands <= 1:
+        # One tiny forward per decision: launch + transfer latency dominates, CPU is faster
+        print("Warning: --device cuda needs batched inference (--batch_hands > 1). Falling back to CPU.")
+        args.device = 'cpu'
+        device = torch.device('cpu')
     log_dir = os.path.join(args.log_dir, f"{args.team_a_name}_vs_{args.team_b_name}_{int(time.time())}")
-    writer = SummaryWriter(log_dir=log_dir)
+    writer = SummaryWriter(log_dir=log_dir, flush_secs=60)
     print(f"Logging tournament to {log_dir}")
     
+    # Agent specs (load_agent kwargs), also used to rebuild agents in worker processes
+    agent_specs = [
+        dict(bidding_path=args.team_a_bidding, playing_path=args.team_a_playing, device=args.device,
+             name=args.team_a_name, use_onnx=args.onnx, quantize=args.quantize, jit=args.jit, compile=args.compile),
+        dict(bidding_path=args.team_b_bidding, playing_path=args.team_b_playing, device=args.device,
+             name=args.team_b_name, use_onnx=args.onnx, quantize=args.quantize, jit=args.jit, compile=args.compile),
+    ]
+    
     # Initialize Agents
     print("Loading Team A Agents...")
-    agent_a = load_agent(args.team_a_bidding, args.team_a_playing, device, name=args.team_a_name)
+    agent_a = load_agent(**agent_specs[0])
     team_a = Team(args.team_a_name, agent_a)
     
     print("Loading Team B Agents...")
-    agent_b = load_agent(args.team_b_bidding, args.team_b_playing, device, name=args.team_b_name)
+    if same_agent_spec(*agent_specs):
+        # Same models on both sides: share the instance (enables the symmetric duplicate shortcut)
+        agent_b = agent_a
+    else:
+        agent_b = load_agent(**agent_specs[1])
     team_b = Team(args.team_b_name, agent_b)
     
+    # INT8 agents: check they still take the FP32 decisions before spending a tournament on them
+    if args.quantize and device.type == 'cpu':
+        with torch.inference_mode():
+            checked = [(agent_specs[0], agent_a)] if agent_b is agent_a else list(zip(agent_specs, (agent_a, agent_b)))
+            for spec, ag in checked:
+                if isinstance(ag, agent.AI_Agent):
+                    rate = _quantized_agreement(ag, spec)
+                    print(f"{spec['name']}: INT8 vs FP32 action agreement {rate:.1%} (100 calibration hands)")
+    
     # Initialize Engine
-    engine = TournamentEngine(team_a, team_b)
+    engine = TournamentEngine(team_a, team_b, nb_games=args.nb_games, seed=args.seed)
     
     # Determine which is 'Baseline' (Heuristic) for Margin Metric
     baseline_team = None
@@ -64,62 +108,79 @@ def main():
     
     print(f"Starting Tournament: {args.nb_games} Hands (Duplicate format)...")
     
-    for i in tqdm(range(args.nb_games)):
-        res = engine.play_duplicate_hand()
-        
-        # Log basic metrics per hand
-        step = i + 1
-        
-        relative_score = res['relative_score_b'] # (Score B - Score A)
-        
-        writer.add_scalar('Score/Relative_Diff_Per_Hand', relative_score, step)
-        writer.add_scalar('Score/Total_Team_A', engine.metrics.team_a_score, step)
-        writer.add_scalar('Score/Total_Team_B', engine.metrics.team_b_score, step)
-        
-        # Histogram of relative scores (Stability)
-        if step % 50 == 0:
-            writer.add_histogram('Distribution/Relative_Score_Diff', 
-                                 torch.tensor(engine.metrics.relative_points), step)
+    # Relative scores are logged once per chunk (mean over its hands) and as a histogram every SCORE_LOG_EVERY hands
+    SCORE_LOG_EVERY = 50
+    # Cumulative metrics (win rate, bidding, defense) are logged every log_stride hands:
+    # at least LOG_EVERY, and no more than ~500 points per curve on long tournaments
+    LOG_EVERY = 10
+    log_stride = max(LOG_EVERY, args.nb_games // 500)
+    
+    # Helper for Bidding Stats (row = one team's MatchMetrics.stats row)
+    def log_bidding_stats(row, prefix, step):
+        taken = row[BID_TAKEN]
+        if taken > 0:
+            success_rate = row[BID_MADE] / taken
+            avg_value = row[BID_VALUE] / taken
+            writer.add_scalar(f'{prefix}/SuccessRate', success_rate, step)
+            writer.add_scalar(f'{prefix}/AvgContractValue', avg_value, step)
+    
+    # Helper for Defense Stats
+    def log_defense_stats(row, prefix, step):
+        count = row[DEF_COUNT]
+        if count > 0:
+            avg_score = row[DEF_SCORE] / count
+            writer.add_scalar(f'{prefix}/AvgDefenseScore', avg_score, step)
+    
+    m = engine.metrics
+    progress = tqdm(total=args.nb_games)
+    
+    def log_chunk(step, relative_b):
+        # engine.run() callback: a chunk of len(relative_b) hands was just recorded into m (step = hands so far)
+        n = len(relative_b)
+        progress.update(n)
+        relative_score = float(relative_b.mean()) # (Score B - Score A), mean over the chunk's hands
+        writer.add_scalar('Score/Relative_Diff_Mean_Per_Chunk', relative_score, step)
+        writer.add_scalars('Score/Total', {'Team_A': m.team_a_score, 'Team_B': m.team_b_score}, step)
         
         # Baseline Margin Metric
         # If A is heuristic, Margin = B_Score - A_Score (which is relative_score).
         # If B is heuristic, Margin = A_Score - B_Score (which is -relative_score).
         if is_heuristic_a:
              # A is baseline. How much better is B?
-             writer.add_scalar('Tournament/Baseline_Margin', relative_score, step)
+             writer.add_scalar('Tournament/Baseline_Margin_Mean_Per_Chunk', relative_score, step)
         elif is_heuristic_b:
              # B is baseline. How much better is A?
-             writer.add_scalar('Tournament/Baseline_Margin', -relative_score, step)
-             
+             writer.add_scalar('Tournament/Baseline_Margin_Mean_Per_Chunk', -relative_score, step)
+        
+        # Histogram of relative scores (Stability)
+        if step // SCORE_LOG_EVERY > (step - n) // SCORE_LOG_EVERY:
+            writer.add_histogram('Distribution/Relative_Score_Diff', torch.from_numpy(m.relative_scores), step)
+        
         # --- Advanced Metrics (Cumulative) ---
-        if engine.metrics.games_played > 0:
-            # Win Rate
-            wr_a = engine.metrics.team_a_wins / engine.metrics.games_played
-            wr_b = engine.metrics.team_b_wins / engine.metrics.games_played
-            writer.add_scalar('Performance/WinRate_A', wr_a, step)
-            writer.add_scalar('Performance/WinRate_B', wr_b, step)
-            
-            # Helper for Bidding Stats
-            def log_bidding_stats(stats, prefix):
-                taken = stats['taken']
-                if taken > 0:
-                    success_rate = stats['made'] / taken
-                    avg_value = stats['total_value'] / taken
-                    writer.add_scalar(f'{prefix}/SuccessRate', success_rate, step)
-                    writer.add_scalar(f'{prefix}/AvgContractValue', avg_value, step)
-            
-            log_bidding_stats(engine.metrics.team_a_bidding_stats, 'Bidding/Team_A')
-            log_bidding_stats(engine.metrics.team_b_bidding_stats, 'Bidding/Team_B')
+        # Running ratios barely move hand to hand: sample them every log_stride hands.
+        # Counters are still updated every hand, so no information is lost.
+        games = m.games_played
+        if games > 0 and (step // log_stride > (step - n) // log_stride or step == args.nb_games):
+            # Win Rate (both teams in one event record)
+            stats = m.stats
+            wr_a = stats[TEAM_A, WINS] / games
+            wr_b = stats[TEAM_B, WINS] / games
+            writer.add_scalars('Performance/WinRate', {'Team_A': wr_a, 'Team_B': wr_b}, step)
             
-            # Helper for Defense Stats
-            def log_defense_stats(stats, prefix):
-                count = stats['count']
-                if count > 0:
-                    avg_score = stats['score'] / count
-                    writer.add_scalar(f'{prefix}/AvgDefenseScore', avg_score, step)
+            log_bidding_stats(stats[TEAM_A], 'Bidding/Team_A', step)
+            log_bidding_stats(stats[TEAM_B], 'Bidding/Team_B', step)
             
-            log_defense_stats(engine.metrics.team_a_defense_stats, 'Defense/Team_A')
-            log_defense_stats(engine.metrics.team_b_defense_stats, 'Defense/Team_B')
+            log_defense_stats(stats[TEAM_A], 'Defense/Team_A', step)
+            log_defense_stats(stats[TEAM_B], 'Defense/Team_B', step)
+    
+    # Enter inference mode once for the whole tournament (not per agent call).
+    # Chunks of batch_hands hands are played concurrently (agent queries batched into one forward
+    # per round), in worker processes on CPU. Deals only depend on --seed and --batch_hands, not on --workers.
+    workers = args.workers if device.type == 'cpu' else 1
+    with torch.inference_mode():
+        engine.run(args.nb_games, workers=workers, chunk_size=max(1, args.batch_hands),
+                   agent_specs=agent_specs, on_chunk=log_chunk)
+    progress.close()
 
     # Final Review
     total_games = args.nb_games * 2 # 2 games per hand
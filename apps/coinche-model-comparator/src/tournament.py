@@ -1,46 +1,273 @@
 
 import coinche_engine
-import random
-import torch
+from baseline_agents import HeuristicAgent, heuristic_bid, heuristic_card, decide_bid
+import contextlib
 import numpy as np
-from enum import Enum
+from concurrent.futures import ProcessPoolExecutor
+from enum import IntEnum
+
+class Phase(IntEnum):
+    # CoincheMatch.phase codes (see manager.rs)
+    BIDDING = 0
+    PLAYING = 1
+    FINISHED = 2
+
+# Plain-int aliases for the game loop (module global, no enum attribute lookup per check)
+PHASE_BIDDING = int(Phase.BIDDING)
+PHASE_PLAYING = int(Phase.PLAYING)
+PHASE_FINISHED = int(Phase.FINISHED)
 
 class Team:
     def __init__(self, name, agent):
         self.name = name
         self.agent = agent
 
+# MatchMetrics.stats columns (rows: 0 = Team A, 1 = Team B)
+BID_TAKEN, BID_MADE, BID_VALUE, DEF_SCORE, DEF_COUNT, WINS = range(6)
+TEAM_A, TEAM_B = 0, 1
+
 class MatchMetrics:
-    def __init__(self):
+    def __init__(self, nb_games=0):
         self.team_a_score = 0
         self.team_b_score = 0
         # Advanced Metrics
         self.games_played = 0
         
-        # Win Rate
-        self.team_a_wins = 0
-        self.team_b_wins = 0
+        # Per-team counters, one row per team:
+        # Bidding [ContractsTaken, ContractsMade, TotalValue], Defense [TotalPointsScoredAsDefender, GamesDefended], Wins
+        self.stats = np.zeros((2, 6), dtype=np.int64)
         
-        # Bidding Stats [ContractsTaken, ContractsMade, TotalValue]
-        self.team_a_bidding_stats = {'taken': 0, 'made': 0, 'total_value': 0}
-        self.team_b_bidding_stats = {'taken': 0, 'made': 0, 'total_value': 0}
+        # Relative points: Score(Team B) - Score(Team A) in duplicate setting
+        # Preallocated for nb_games hands (grown if more are recorded); valid entries are [:_rel_idx]
+        self.relative_points = np.empty(max(nb_games, 1), dtype=np.int32)
+        self._rel_idx = 0
+
+    @property
+    def relative_scores(self):
+        # View of the relative points recorded so far (one entry per hand)
+        return self.relative_points[:self._rel_idx]
+
+    # Dict/int views of self.stats (summary code; the hot path indexes self.stats directly)
+    @property
+    def team_a_wins(self):
+        return int(self.stats[TEAM_A, WINS])
+
+    @property
+    def team_b_wins(self):
+        return int(self.stats[TEAM_B, WINS])
+
+    def _bidding_stats(self, team):
+        row = self.stats[team]
+        return {'taken': int(row[BID_TAKEN]), 'made': int(row[BID_MADE]), 'total_value': int(row[BID_VALUE])}
+
+    def _defense_stats(self, team):
+        row = self.stats[team]
+        return {'score': int(row[DEF_SCORE]), 'count': int(row[DEF_COUNT])}
+
+    @property
+    def team_a_bidding_stats(self):
+        return self._bidding_stats(TEAM_A)
+
+    @property
+    def team_b_bidding_stats(self):
+        return self._bidding_stats(TEAM_B)
+
+    @property
+    def team_a_defense_stats(self):
+        return self._defense_stats(TEAM_A)
+
+    @property
+    def team_b_defense_stats(self):
+        return self._defense_stats(TEAM_B)
+
+def _update_stats(stats, res, ns, ew):
+    """
+    Adds one game's win/contract/defense counts to MatchMetrics.stats.
+    ns, ew: stats rows of the teams sitting North-South / East-West.
+    """
+    score_ns = res['points_ns']
+    score_ew = res['points_ew']
+    
+    # Win Check
+    if score_ns > score_ew:
+        stats[ns, WINS] += 1
+    elif score_ew > score_ns:
+        stats[ew, WINS] += 1
+    
+    # Contract Stats
+    taker = res['taker'] # 0,1,2,3 or None
+    if taker is not None:
+        # 0/2 = NS, 1/3 = EW. The OTHER team defends.
+        if taker % 2 == 0:
+            taker_team, def_team, defender_score = ns, ew, score_ew
+        else:
+            taker_team, def_team, defender_score = ew, ns, score_ns
         
-        # Defense Stats [TotalPointsScoredAsDefender, GamesDefended]
-        self.team_a_defense_stats = {'score': 0, 'count': 0}
-        self.team_b_defense_stats = {'score': 0, 'count': 0}
+        # Update Taker Stats
+        stats[taker_team, BID_TAKEN] += 1
+        stats[taker_team, BID_VALUE] += res['contract_value']
+        if res['contract_made']:
+            stats[taker_team, BID_MADE] += 1
         
-        # Relative points: Score(Team B) - Score(Team A) in duplicate setting
-        self.relative_points = []
+        # Update Defender Stats
+        stats[def_team, DEF_SCORE] += defender_score
+        stats[def_team, DEF_COUNT] += 1
+
+def _update_stats_batch(stats, ns_pts, ew_pts, taker, value, made, ns, ew):
+    """
+    _update_stats over arrays of games that share the same seating (taker = -1 when passed out).
+    """
+    stats[ns, WINS] += np.count_nonzero(ns_pts > ew_pts)
+    stats[ew, WINS] += np.count_nonzero(ew_pts > ns_pts)
+    
+    taken = taker >= 0
+    taker_ns = taken & (taker % 2 == 0)
+    taker_ew = taken & (taker % 2 == 1)
+    for taker_team, def_team, mask, def_pts in ((ns, ew, taker_ns, ew_pts), (ew, ns, taker_ew, ns_pts)):
+        count = np.count_nonzero(mask)
+        stats[taker_team, BID_TAKEN] += count
+        stats[taker_team, BID_VALUE] += value[mask].sum()
+        stats[taker_team, BID_MADE] += np.count_nonzero(made & mask)
+        stats[def_team, DEF_SCORE] += def_pts[mask].sum()
+        stats[def_team, DEF_COUNT] += count
+
+class _Auction:
+    """
+    Auction state for the game loops, tracked locally rather than read back through
+    get_bidding_state() (a clone of the whole BiddingState, history included) each turn.
+    Exact because every bid goes through place(): seats rotate from the dealer's left
+    and each bid takes the contract.
+    """
+    __slots__ = ('_bid_fn', 'current_player', 'contract_value', 'contract_owner', 'trump')
+
+    def __init__(self, match, dealer):
+        self._bid_fn = match.bid
+        self.current_player = (dealer + 1) % 4
+        # No contract yet: value 0, owner -1 (decide_bid's convention). owner stays -1 on a pass-out.
+        self.contract_value = 0
+        self.contract_owner = -1
+        # Trump of the final contract = suit of the last bid placed
+        self.trump = None
+
+    def place(self, decision):
+        # decision: decide_bid action code (-1 = pass). decide_bid only emits legal bids
+        # (multiple of 10, above the contract, <= 160), so an engine refusal is a logic bug and is left to raise.
+        if decision < 0:
+            self._bid_fn(None)
+        else:
+            self.contract_value, self.contract_owner, self.trump = decision // 10, self.current_player, decision % 10
+            self._bid_fn(coinche_engine.Bid(self.contract_value, self.trump))
+        self.current_player = (self.current_player + 1) % 4
+
+def _answer(agent, kind, query):
+    # Direct (unbatched) agent call for one _game_steps decision
+    if kind == 'bid':
+        return agent.get_bid_action_batch([query])[0]
+    return agent.get_card(*query)
+
+def same_agent_spec(spec_a, spec_b):
+    # Identical models/options (names aside) -> share one agent instance
+    ignore = ('name',)
+    return {k: v for k, v in spec_a.items() if k not in ignore} == {k: v for k, v in spec_b.items() if k not in ignore}
+
+# --- Parallel run() workers ---
+# Each worker process loads its own agents (from their load_agent specs) and TournamentEngine once,
+# then plays chunks of hands.
+_worker_engine = None
+
+def _init_worker(agent_specs):
+    global _worker_engine
+    # Imported here: the tournament itself stays torch-free
+    import torch
+    from agent import load_agent
+    torch.set_num_threads(1) # One intra-op thread per worker to avoid oversubscription
+    agent_a = load_agent(**agent_specs[0])
+    agent_b = agent_a if same_agent_spec(*agent_specs) else load_agent(**agent_specs[1])
+    _worker_engine = TournamentEngine(Team(agent_specs[0]['name'], agent_a), Team(agent_specs[1]['name'], agent_b))
+
+def _play_chunk(seed, n_hands):
+    return _worker_engine.play_duplicate_batch(n_hands, seed)
 
 class TournamentEngine:
-    def __init__(self, team_a, team_b):
+    def __init__(self, team_a, team_b, nb_games=0, seed=None):
         self.team_a = team_a # Team A (Agent A)
         self.team_b = team_b # Team B (Agent B)
-        self.metrics = MatchMetrics()
+        self.metrics = MatchMetrics(nb_games)
+        
+        # Binding capabilities, probed once. Attribute presence is a class-level property of PlayingState.
+        self._has_current_trick = hasattr(coinche_engine.PlayingState, 'current_trick')
+        
+        # Seat -> agent, fixed for the whole tournament
+        # Game 1 Agents: 0=A, 1=B, 2=A, 3=B
+        self._agents_g1 = (team_a.agent, team_b.agent, team_a.agent, team_b.agent)
+        # Game 2 Agents: 0=B, 1=A, 2=B, 3=A
+        self._agents_g2 = (team_b.agent, team_a.agent, team_b.agent, team_a.agent)
+        
+        # Engine-wide generator (PCG64) for hands played without an explicit seed
+        self._rng = np.random.default_rng(seed)
         
+        # Same deterministic agent on both teams: Game 2 replays Game 1 exactly
+        # (same hands, same seats, same policy), so it is skipped and copied.
+        self._symmetric = team_a.agent is team_b.agent and team_a.agent.deterministic
+        
+        # Heuristic vs heuristic: nothing to batch, play each game with the specialized loop
+        self._heuristic_only = type(team_a.agent) is HeuristicAgent and type(team_b.agent) is HeuristicAgent
+        if self._heuristic_only:
+            self._play_game = self._play_game_heuristic
+        
+    def run(self, n_hands, workers=1, chunk_size=32, agent_specs=None, on_chunk=None):
+        """
+        Plays n_hands duplicate hands and records them into self.metrics.
+        Hands are played in chunks of chunk_size (batched agent queries), each dealt from its
+        own seed drawn from the engine generator: results depend on the engine seed and
+        chunk_size, not on `workers`.
+        With workers > 1, chunks are played by a process pool. Each worker loads its own agents
+        from agent_specs (load_agent kwargs of Team A and Team B) and returns the chunk's hands,
+        recorded here in submission order.
+        on_chunk(hands_done, relative_b), if given, is called after each chunk is recorded
+        (e.g. for logging): hands_done = hands recorded so far, relative_b = record_batch()'s
+        relative_score_b array for the chunk.
+        """
+        sizes = [min(chunk_size, n_hands - i) for i in range(0, n_hands, chunk_size)]
+        seeds = self.chunk_seeds(len(sizes))
+        
+        # The worker pool (if any) lives in this block: it is shut down even on errors / Ctrl-C
+        with contextlib.ExitStack() as stack:
+            if workers > 1 and len(sizes) > 1:
+                if agent_specs is None:
+                    raise ValueError("run() needs agent_specs to load the agents in worker processes (workers > 1)")
+                executor = stack.enter_context(
+                    ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(agent_specs,)))
+                chunks = executor.map(_play_chunk, seeds, sizes)
+            else:
+                chunks = (self.play_duplicate_batch(n, seed) for seed, n in zip(seeds, sizes))
+            
+            hands_done = 0
+            for hands in chunks:
+                relative_b = self.record_batch(hands)
+                hands_done += len(hands)
+                if on_chunk is not None:
+                    on_chunk(hands_done, relative_b)
+        return self.metrics
+
+    def chunk_seeds(self, n):
+        """
+        n seeds for play_duplicate_batch chunks, drawn from the engine generator: the engine
+        seed is the single seed source of a tournament.
+        """
+        return self._rng.integers(0, 2**63, size=n).tolist()
+
     def play_duplicate_hand(self):
         """
-        Plays one duplicate hand (2 games).
+        Plays one duplicate hand (2 games) and records it into self.metrics.
+        """
+        return self.record_hand(self.play_duplicate_hand_stateless())
+
+    def play_duplicate_hand_stateless(self, seed=None):
+        """
+        Plays one duplicate hand (2 games) without touching self.metrics.
+        The deal is a pure function of `seed` (when given), so hands are reproducible
+        and can be farmed out to worker processes.
         Strict Duplicate Logic:
         1. Deal Hand H (4x u32).
         2. Game 1: NS=Team A, EW=Team B. Agents: [A, B, A, B]
@@ -48,19 +275,98 @@ class TournamentEngine:
            Crucial: Uses EXACT SAME 'hands' array.
            This compares Team A's performance with Hand 0 (North) vs Team B's performance with Hand 0 (North).
         """
-        hands = self._deal_random_hands()
-        dealer = random.randint(0, 3)
-        
+        hands, dealer, _, _ = self._setup_duplicate(seed)
+        if self._heuristic_only:
+            return self._play_duplicate(hands, dealer)
+        # Through the batched scheduler: G1/G2 decisions of the same agent share one forward
+        return self._play_batch([(hands, dealer)])[0]
+
+    def _play_duplicate(self, hands, dealer):
         # --- Game 1: NS=A, EW=B ---
-        # Agents: 0=A, 1=B, 2=A, 3=B
-        agents_g1 = [self.team_a.agent, self.team_b.agent, self.team_a.agent, self.team_b.agent]
-        res_g1 = self._play_game(hands, dealer, agents_g1)
+        res_g1 = self._play_game(hands, dealer, self._agents_g1)
         
         # --- Game 2: NS=B, EW=A ---
-        # Agents: 0=B, 1=A, 2=B, 3=A
         # Note: We reuse 'hands' and 'dealer' strictly.
-        agents_g2 = [self.team_b.agent, self.team_a.agent, self.team_b.agent, self.team_a.agent]
-        res_g2 = self._play_game(hands, dealer, agents_g2)
+        if self._symmetric:
+            res_g2 = dict(res_g1)
+        else:
+            res_g2 = self._play_game(hands, dealer, self._agents_g2)
+        
+        return {'g1': res_g1, 'g2': res_g2}
+
+    def play_duplicate_batch(self, n_hands, seed=None):
+        """
+        Plays n_hands duplicate hands concurrently, batching agent queries.
+        Same results format as play_duplicate_hand_stateless(). The hands are dealt in one
+        vectorized call (see _deal_batch) from a generator seeded with `seed`, so a chunk is
+        reproducible from its seed alone and can be played in any process; without a seed
+        they come from the engine generator.
+        
+        All 2*len(seeds) games run as coroutines (_game_steps). Each round, every live game
+        has exactly one pending decision; those are grouped per (agent, kind) and answered with
+        a single bid-action / card batch call, i.e. one forward pass for AI agents.
+        """
+        rng = np.random.default_rng(seed) if seed is not None else self._rng
+        return self._play_batch(list(zip(*self._deal_batch(n_hands, rng))))
+
+    def _play_batch(self, deals):
+        # deals: list of (hands, dealer)
+        if self._heuristic_only:
+            return [self._play_duplicate(hands, dealer) for hands, dealer in deals]
+        
+        games = []
+        for hands, dealer in deals:
+            games.append(self._game_steps(hands, dealer, self._agents_g1))
+            if not self._symmetric:
+                games.append(self._game_steps(hands, dealer, self._agents_g2))
+        
+        results = [None] * len(games)
+        pending = {} # game index -> request
+        for gi, game in enumerate(games):
+            self._advance(games, gi, None, pending, results, first=True)
+        
+        while pending:
+            # Group requests by (agent, kind) so each agent sees one batch per round
+            groups = {}
+            for gi, (agent, kind, query) in pending.items():
+                groups.setdefault((id(agent), kind), (agent, kind, []))[2].append((gi, query))
+            pending = {}
+            # Submit every agent's batch before collecting any, so GPU agents (one CUDA stream
+            # each) run their forwards concurrently
+            submitted = []
+            for agent, kind, items in groups.values():
+                queries = [q for _, q in items]
+                if kind == 'bid':
+                    submitted.append((items, agent.submit_bid_action_batch(queries)))
+                else:
+                    submitted.append((items, agent.submit_card_batch(queries)))
+            for items, collect in submitted:
+                for (gi, _), answer in zip(items, collect()):
+                    self._advance(games, gi, answer, pending, results)
+        
+        if self._symmetric:
+            return [{'g1': res, 'g2': dict(res)} for res in results]
+        return [{'g1': results[2 * i], 'g2': results[2 * i + 1]} for i in range(len(deals))]
+
+    def _advance(self, games, gi, answer, pending, results, first=False):
+        try:
+            pending[gi] = next(games[gi]) if first else games[gi].send(answer)
+        except StopIteration as stop:
+            results[gi] = stop.value
+
+    def _setup_duplicate(self, seed):
+        rng = np.random.default_rng(seed) if seed is not None else self._rng
+        
+        hands = self._deal_random_hands(rng)
+        dealer = int(rng.integers(0, 4))
+        return hands, dealer, self._agents_g1, self._agents_g2
+
+    def record_hand(self, hand):
+        """
+        Updates self.metrics with the outcome of play_duplicate_hand_stateless().
+        """
+        res_g1 = hand['g1']
+        res_g2 = hand['g2']
         
         # --- Scoring & Metrics ---
         # Goal: Did A outperform B with the same cards?
@@ -83,55 +389,22 @@ class TournamentEngine:
         # Relative points for B (as requested in logging usually B is challenger)
         total_relative_points_b = -total_diff_for_a
         
-        self.metrics.relative_points.append(total_relative_points_b)
+        m = self.metrics
+        if m._rel_idx == len(m.relative_points):
+            m.relative_points = np.resize(m.relative_points, 2 * len(m.relative_points))
+        m.relative_points[m._rel_idx] = total_relative_points_b
+        m._rel_idx += 1
         
         # Update Metrics
-        self.metrics.games_played += 2 # 2 games
+        m.games_played += 2 # 2 games
         
-        # Helper to update per-game stats
-        def update_stats(res, team_ns_is_a):
-            # Win Check
-            score_ns = res['points_ns']
-            score_ew = res['points_ew']
-            
-            if team_ns_is_a:
-                if score_ns > score_ew: self.metrics.team_a_wins += 1
-                elif score_ew > score_ns: self.metrics.team_b_wins += 1
-            else: # NS is B
-                if score_ns > score_ew: self.metrics.team_b_wins += 1
-                elif score_ew > score_ns: self.metrics.team_a_wins += 1
-                
-            # Contract Stats
-            taker = res['taker'] # 0,1,2,3 or None
-            if taker is not None:
-                # Identify Taking Team
-                # 0/2 = NS, 1/3 = EW
-                taker_is_ns = (taker % 2 == 0)
-                taker_team_is_a = (taker_is_ns == team_ns_is_a)
-                
-                # Update Taker Stats
-                stats = self.metrics.team_a_bidding_stats if taker_team_is_a else self.metrics.team_b_bidding_stats
-                stats['taken'] += 1
-                stats['total_value'] += res['contract_value']
-                if res['contract_made']:
-                    stats['made'] += 1
-
-                # Update Defender Stats (The OTHER team)
-                # If Taker is A, Defender is B.
-                def_stats = self.metrics.team_b_defense_stats if taker_team_is_a else self.metrics.team_a_defense_stats
-                
-                # Defender Score:
-                # If Taker is NS, Defender is EW (Score EW)
-                defender_score = score_ew if taker_is_ns else score_ns
-                def_stats['score'] += defender_score
-                def_stats['count'] += 1
-            
-        update_stats(res_g1, team_ns_is_a=True)
-        update_stats(res_g2, team_ns_is_a=False)
+        # Per-game stats
+        _update_stats(m.stats, res_g1, TEAM_A, TEAM_B) # Game 1: NS=A, EW=B
+        _update_stats(m.stats, res_g2, TEAM_B, TEAM_A) # Game 2: NS=B, EW=A
 
         # Update raw totals
-        self.metrics.team_a_score += (score_a_ns + score_a_ew)
-        self.metrics.team_b_score += (score_b_ew + score_b_ns)
+        m.team_a_score += (score_a_ns + score_a_ew)
+        m.team_b_score += (score_b_ew + score_b_ns)
         
         return {
             'relative_score_b': total_relative_points_b,
@@ -139,26 +412,121 @@ class TournamentEngine:
             'g2': res_g2
         }
 
+    def record_batch(self, hands):
+        """
+        Vectorized record_hand over a list of play_duplicate_* results: same metrics,
+        aggregated with array ops. Returns the relative_score_b array (one entry per hand).
+        """
+        n = len(hands)
+        m = self.metrics
+        
+        def column(game, key):
+            return np.array([h[game][key] for h in hands], dtype=np.int64)
+        
+        def takers(game):
+            return np.array([-1 if h[game]['taker'] is None else h[game]['taker'] for h in hands], dtype=np.int64)
+        
+        ns1, ew1 = column('g1', 'points_ns'), column('g1', 'points_ew')
+        ns2, ew2 = column('g2', 'points_ns'), column('g2', 'points_ew')
+        
+        # Relative points for B: -((A_NS - B_NS) + (A_EW - B_EW)), see record_hand
+        relative_b = np.subtract(ns2, ns1) + np.subtract(ew1, ew2)
+        
+        end = m._rel_idx + n
+        if end > len(m.relative_points):
+            m.relative_points = np.resize(m.relative_points, max(end, 2 * len(m.relative_points)))
+        m.relative_points[m._rel_idx:end] = relative_b
+        m._rel_idx = end
+        
+        m.games_played += 2 * n
+        _update_stats_batch(m.stats, ns1, ew1, takers('g1'), column('g1', 'contract_value'),
+                            column('g1', 'contract_made').astype(bool), TEAM_A, TEAM_B)
+        _update_stats_batch(m.stats, ns2, ew2, takers('g2'), column('g2', 'contract_value'),
+                            column('g2', 'contract_made').astype(bool), TEAM_B, TEAM_A)
+        
+        m.team_a_score += int(ns1.sum() + ew2.sum())
+        m.team_b_score += int(ew1.sum() + ns2.sum())
+        return relative_b
+
     def _play_game(self, hands, dealer, agents):
         """
-        Simulates a full game.
+        Simulates a full game, answering each decision with a direct agent call.
+        """
+        steps = self._game_steps(hands, dealer, agents)
+        try:
+            agent, kind, query = next(steps)
+            while True:
+                agent, kind, query = steps.send(_answer(agent, kind, query))
+        except StopIteration as stop:
+            return stop.value
+
+    def decision_agreement(self, candidate, n_hands, seed=None):
+        """
+        Fraction of decisions where `candidate` takes the same action as Team A's agent.
+        Team A's agent plays n_hands games against itself (dealt like play_duplicate_batch);
+        the candidate answers every query of those games without affecting them.
+        Bids are compared as actions, not raw estimates.
+        """
+        reference = self.team_a.agent
+        agents = (reference,) * 4
+        rng = np.random.default_rng(seed) if seed is not None else self._rng
+        same = total = 0
+        for hands, dealer in zip(*self._deal_batch(n_hands, rng)):
+            steps = self._game_steps(hands, dealer, agents)
+            try:
+                _, kind, query = next(steps)
+                while True:
+                    answer = _answer(reference, kind, query)
+                    same += answer == _answer(candidate, kind, query)
+                    total += 1
+                    _, kind, query = steps.send(answer)
+            except StopIteration:
+                pass
+        return same / max(total, 1)
+
+    def _play_game_heuristic(self, hands, dealer, agents):
+        """
+        _play_game specialized for heuristic-only tournaments. Same game as _game_steps, but
+        decisions call heuristic_bid / heuristic_card directly: no coroutine, no per-seat agent.
         """
         match = coinche_engine.CoincheMatch(dealer, hands)
         
-        # --- Bidding Phase ---
-        contract_info = {'taker': None, 'value': 0}
+        play_fn = match.play_card
+        get_playing = match.get_playing_state
+        
+        # --- Bidding Phase --- (same decision rules and auction tracking as _game_steps)
+        auction = _Auction(match, dealer)
+        while match.phase == PHASE_BIDDING:
+            current_player = auction.current_player
+            suit_idx, est_score = heuristic_bid(hands[current_player])
+            auction.place(decide_bid(est_score, suit_idx, auction.contract_value, auction.contract_owner, current_player))
+        
+        if auction.contract_owner < 0:
+            # Passed out: nothing to play
+            return self._extract_result(match, None, 0)
+        
+        # --- Playing Phase --- (the heuristic only looks at legal moves and trump)
+        trump = auction.trump
+        while match.phase == PHASE_PLAYING:
+            play_fn(heuristic_card(get_playing().get_legal_moves(), trump))
+        
+        return self._extract_result(match, auction.contract_owner, auction.contract_value)
 
+    def _game_steps(self, hands, dealer, agents):
+        """
+        Game coroutine. Yields (agent, 'bid' | 'card', query_args) for every decision and
+        expects the agent's answer to be sent back. Returns the result dict.
+        """
+        match = coinche_engine.CoincheMatch(dealer, hands)
+        
+        # Bound methods as locals (LOAD_FAST instead of attribute lookups in the loops)
+        play_fn = match.play_card
+        get_playing = match.get_playing_state
+        
         # --- Bidding Phase ---
-        while "BIDDING" in match.phase_name():
-            state = match.get_bidding_state()
-            
-            # Update Contract Info (Track the active contract)
-            if state.contract is not None:
-                contract_info['value'] = state.contract.value
-                contract_info['taker'] = state.contract_owner
-                # print(f"DEBUG: Contract found! Value: {state.contract.value}, Owner: {state.contract_owner}")
-            
-            current_player = state.current_player
+        auction = _Auction(match, dealer)
+        while match.phase == PHASE_BIDDING:
+            current_player = auction.current_player
             agent = agents[current_player]
             
             # Get agent's hand (mask)
@@ -170,99 +538,31 @@ class TournamentEngine:
             # 2. If Value > Current Contract or Min Bid, Bid it.
             # 3. Else Pass.
             # 4. (Advanced) Partner context? For now, independent.
-            
-            # Simple Bidding Heuristic based on ValueNet
-            suit_idx, est_score = agent.get_bid(p_hand)
-            
-            # Rules: 
-            # - Must bid higher than current contract (min 80).
-            # - increments of 10.
-            current_contract = state.contract # Option<Bid>
-            min_bid_val = 80
-            if current_contract is not None:
-                min_bid_val = current_contract.value + 10
-            
-            # Round est_score to nearest 10
-            bid_val = int(round(est_score / 10.0)) * 10
-            
-            # Check legality
-            if bid_val < min_bid_val:
-                action = None # Pass
-            else:
-                # Cap at 160 (or 180?)
-                if bid_val > 160: bid_val = 160
-                
-                # Check if we assume we can make it. 
-                # If partner is winning, we might raise? 
-                # For now: Greedy. If my hand value > current, I bid.
-                
-                # Is contract owned by team?
-                contract_owner = state.contract_owner
-                if contract_owner is not None:
-                    # If my team owns it
-                    if (contract_owner % 2) == (current_player % 2):
-                         # If my bid_val is significantly higher, raise?
-                         # Else pass.
-                         if bid_val > min_bid_val + 10:
-                             action = coinche_engine.Bid(bid_val, suit_idx)
-                         else:
-                             action = None
-                    else:
-                        # Opponent owns it. Overbid?
-                         if bid_val >= min_bid_val:
-                             action = coinche_engine.Bid(bid_val, suit_idx)
-                         else:
-                             action = None
-                else:
-                    # No contract yet
-                    if bid_val >= 80:
-                        action = coinche_engine.Bid(bid_val, suit_idx)
-                    else:
-                        action = None
+            # The agent applies the rules itself (see agent.decide_bid) and answers with an action code.
+            decision = yield (agent, 'bid', (p_hand, auction.contract_value, auction.contract_owner, current_player))
             
             # Apply Bid
-            try:
-                match.bid(action)
-            except Exception as e:
-                # Fallback to Pass if illegal (e.g. error in logic)
-                # print(f"Bid Error: {e}. Force Pass.")
-                match.bid(None)
-                
-        # Final check of contract info (in case the last bid wasn't captured in loop)
-        # Actually, the state updates *after* match.bid(). 
-        # But we read state *before* match.bid() in next iteration.
-        # So we might miss the *final winning bid* if the loop exits immediately.
-        # We need to check BiddingState (if possible) or PlayingState one last time.
-        
-        # Try to peek BiddingState via match if it allows (some engines do)
-        # Or check PlayingState as backup.
-        try:
-             # If we are playing, check playing state for final contract
-             if "PLAYING" in match.phase_name():
-                 ps = match.get_playing_state()
-                 if hasattr(ps, 'contract') and ps.contract is not None:
-                     contract_info['value'] = ps.contract.value
-                 if hasattr(ps, 'contract_owner'):
-                     contract_info['taker'] = ps.contract_owner
-                 elif hasattr(ps, 'taker'):
-                     contract_info['taker'] = ps.taker
-        except:
-             pass
-
+            auction.place(decision)
+        
         # --- Playing Phase ---
-        # If passed out?
-        if "FINISHED" in match.phase_name():
-             # If passed out, taker is None.
-             return self._extract_result(match, contract_info)
+        # Passed out (nobody bid): the game is over, no engine round trip needed
+        if auction.contract_owner < 0:
+            return self._extract_result(match, None, 0)
+        # Otherwise the final contract is the last bid placed
+        trump = auction.trump
+        
+        has_current_trick = self._has_current_trick
+        # Remaining hands, tracked here from the cards played rather than copied out of
+        # state.hands (a full Vec -> list conversion) on every turn.
+        remaining = list(hands)
             
-        while "PLAYING" in match.phase_name():
-            state = match.get_playing_state()
+        while match.phase == PHASE_PLAYING:
+            state = get_playing()
             current_player = state.current_player
             agent = agents[current_player]
             
             # Gamestate Features
-            p_hand = state.hands[current_player] # Remaining hand?
-            # PlayingState exposes current hands? Yes.
+            p_hand = remaining[current_player]
             
             # Extract History from state?
             # The python binding doesn't expose history bitmask directly in PlayingState probably?
@@ -287,57 +587,43 @@ class TournamentEngine:
             
             # Assuming state.current_trick is available (Vec<u8>?)
             # Usage: state.current_trick
-            current_trick = state.current_trick if hasattr(state, 'current_trick') else []
+            current_trick = state.current_trick if has_current_trick else []
             
-            trump = state.trump
             legal_mask = state.get_legal_moves()
             
-            best_card = agent.get_card(p_hand, history_int, current_trick, trump, legal_mask)
+            best_card = yield (agent, 'card', (p_hand, history_int, current_trick, trump, legal_mask))
             
-            match.play_card(best_card)
+            play_fn(best_card)
+            remaining[current_player] = p_hand & ~(1 << best_card)
             
-        return self._extract_result(match, contract_info)
+        return self._extract_result(match, auction.contract_owner, auction.contract_value)
 
-    def _extract_result(self, match, contract_info={}):
+    def _extract_result(self, match, taker, contract_value):
         res = match.get_result()
         
-        # We need Taker and Value. 
-        # MatchResult (rust) has: winner_team, points_ns, points_ew, ...?
-        # Let's rely on what we can get.
-        # If `match` exposes `contract_owner()` or similar.
-        # Checking binding source code would be ideal.
-        # For now, let's assume we can get it via `match.get_bidding_state().contract_owner` before game ends?
-        # Ah, we didn't capture it in `_play_game`.
-        
-        # Workaround: Re-query state?
-        # If game is finished, can we ask for 'contract'?
-        # Let's assume `match.get_current_contract()` exists or `match.get_result()` has it?
-        # Based on previous `lib.rs` read, `get_result` returns `MatchResult`.
-        # `MatchResult` struct in Rust usually has scores.
-        # Let's TRY to read `res.contract_taker` and `res.contract_value` if they exist.
-        # If not, we failed to track them.
-        
-        # Safer Plan: Modify _play_game loop to capture contract right after bidding loop.
-        # See below for that change.
-        
+        # MatchResult carries the scores; taker/value come from the auction tracked in the game loop
         return {
             'points_ns': res.points_ns,
             'points_ew': res.points_ew,
             'contract_made': res.contract_made,
-            'taker': contract_info.get('taker'), 
-            'contract_value': contract_info.get('value', 0)
+            'taker': taker,
+            'contract_value': contract_value
         }
 
-    def _deal_random_hands(self):
-        # 32 cards. Shuffle.
-        deck = list(range(32))
-        random.shuffle(deck)
-        hands = [0] * 4
-        for i in range(4):
-            # Cards 0-7, 8-15, etc
-            h_cards = deck[i*8 : (i+1)*8]
-            mask = 0
-            for c in h_cards:
-                mask |= (1 << c)
-            hands[i] = mask
-        return hands
+    def _deal_random_hands(self, rng=None):
+        if rng is None:
+            rng = self._rng
+        # 32 cards. Shuffle, 8 cards per player (row).
+        perm = rng.permutation(32).astype(np.int64)
+        bits = (np.int64(1) << perm).reshape(4, 8)
+        # Bits are distinct, so sum == OR. Python ints for coinche_engine.CoincheMatch.
+        return bits.sum(axis=1).tolist()
+
+    def _deal_batch(self, n, rng=None):
+        if rng is None:
+            rng = self._rng
+        # n deals at once: (n, 32) row-wise permutations -> (n, 4) hand masks
+        perms = rng.permuted(np.tile(np.arange(32, dtype=np.int64), (n, 1)), axis=1)
+        hands = (np.int64(1) << perms).reshape(n, 4, 8).sum(axis=2)
+        dealers = rng.integers(0, 4, size=n)
+        return hands.tolist(), dealers.tolist()
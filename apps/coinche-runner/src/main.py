@@ -4,6 +4,8 @@ import coinche_engine
 # Card constants
 SUITS = ["Diamonds", "Spades", "Hearts", "Clubs"]
 RANKS = ["7", "8", "9", "10", "J", "Q", "K", "A"]
+# Single-card masks, BITS[c] == 1 << c
+BITS = tuple(1 << c for c in range(32))
 
 def get_card_name(card_idx):
     suit = card_idx // 8
@@ -11,16 +13,9 @@ def get_card_name(card_idx):
     return f"{RANKS[rank]} of {SUITS[suit]}"
 
 def distribute_cards():
-    deck = list(range(32))
-    random.shuffle(deck)
-    hands = [0] * 4
-    for i in range(4):
-        player_cards = deck[i*8 : (i+1)*8]
-        hand_mask = 0
-        for card in player_cards:
-            hand_mask |= (1 << card)
-        hands[i] = hand_mask
-    return hands
+    deck = random.sample(range(32), 32)
+    # 8 distinct bits per player, so sum == OR
+    return [sum(BITS[card] for card in deck[i:i + 8]) for i in range(0, 32, 8)]
 
 def print_state(state, trick_num):
     print(f"\n--- Trick {trick_num + 1}/8 ---")
@@ -61,10 +56,7 @@ def main():
     print("\n=== Initial Hands ===")
     for i in range(4):
         hand_mask = hands[i]
-        cards = []
-        for c in range(32):
-            if (hand_mask & (1 << c)) != 0:
-                cards.append(get_card_name(c))
+        cards = [get_card_name(c) for c, bit in enumerate(BITS) if hand_mask & bit]
         print(f"Player {i}: {', '.join(cards)}")
     print("=====================\n")
     
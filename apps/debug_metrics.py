@@ -1,6 +1,7 @@
 
 import coinche_engine
 import time
+import numpy as np
 
 # Helper to create hand (same logic as bidding tests)
 # 0..7: 7, 8, 9, 10, J, Q, K, A
@@ -18,29 +19,22 @@ SPADES = 1
 HEARTS = 2
 CLUBS = 3
 
-def card(suit, rank):
-    return 1 << (suit * 8 + rank)
+def hand_from_cards(pairs):
+    # (suit, rank) pairs -> hand mask, in one vectorized pass
+    a = np.asarray(pairs, dtype=np.uint64).reshape(-1, 2)
+    return int(np.bitwise_or.reduce(np.uint64(1) << (a[:, 0] * np.uint64(8) + a[:, 1])))
 
 def make_weak_hand(trump_suit=HEARTS):
     # 7, 8 in all suits. 
     # Potential should be 0.
-    h = 0
-    h |= card(HEARTS, RANK_7)
-    h |= card(HEARTS, RANK_8)
-    h |= card(SPADES, RANK_7)
-    h |= card(SPADES, RANK_8)
-    h |= card(DIAMONDS, RANK_7)
-    h |= card(DIAMONDS, RANK_8)
-    h |= card(CLUBS, RANK_7)
-    h |= card(CLUBS, RANK_8)
-    return h
+    return hand_from_cards([(HEARTS, RANK_7), (HEARTS, RANK_8),
+                            (SPADES, RANK_7), (SPADES, RANK_8),
+                            (DIAMONDS, RANK_7), (DIAMONDS, RANK_8),
+                            (CLUBS, RANK_7), (CLUBS, RANK_8)])
 
 def make_capot_hand(trump_suit=HEARTS):
     # All trumps
-    h = 0
-    for r in range(8):
-        h |= card(trump_suit, r)
-    return h
+    return hand_from_cards([(trump_suit, r) for r in range(8)])
 
 def main():
     print("Creating specific hands...")
@@ -54,16 +48,10 @@ def main():
     
     # 3. Random 'Normal' Hand (Top 4 trumps + garbage)
     # Should NOT be weak, NOT be capot.
-    h = 0
-    h |= card(HEARTS, RANK_J)
-    h |= card(HEARTS, RANK_9)
-    h |= card(HEARTS, RANK_A)
-    h |= card(HEARTS, RANK_10)
-    h |= card(SPADES, RANK_7)
-    h |= card(SPADES, RANK_8)
-    h |= card(DIAMONDS, RANK_7)
-    h |= card(DIAMONDS, RANK_8)
-    hands.append(h)
+    hands.append(hand_from_cards([(HEARTS, RANK_J), (HEARTS, RANK_9),
+                                  (HEARTS, RANK_A), (HEARTS, RANK_10),
+                                  (SPADES, RANK_7), (SPADES, RANK_8),
+                                  (DIAMONDS, RANK_7), (DIAMONDS, RANK_8)]))
 
     # Pad with 3 dummy hands for each valid hand to make full deals (S, W, N, E)
     # We only care about South (index 0) for these metrics.
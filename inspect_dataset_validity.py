@@ -1,27 +1,57 @@
 
-import pandas as pd
+import pyarrow.parquet as pq
+import numpy as np
 
-def count_bits(n):
-    return bin(n).count('1')
+def count_bits(arr):
+    # Vectorized popcount of an unsigned int array
+    if hasattr(np, 'bitwise_count'): # NumPy >= 2.0
+        return np.bitwise_count(arr)
+    if len(arr) == 0: # reshape(0, -1) can't infer the bit width
+        return np.zeros(0, dtype=np.int64)
+    return np.unpackbits(arr.view(np.uint8)).reshape(len(arr), -1).sum(axis=1)
+
+def chunk_values(chunk):
+    # Zero-copy view of a primitive Arrow array's values (buffers: [validity, values]).
+    # Null slots hold whatever bytes the writer left there: mask them with the validity bitmap.
+    dtype = np.dtype(chunk.type.to_pandas_dtype())
+    values = np.frombuffer(chunk.buffers()[1], dtype=dtype, count=chunk.offset + len(chunk))
+    return values[chunk.offset:]
 
 try:
     print("Reading dataset/simple_bidding_dataset.parquet...")
-    df = pd.read_parquet("dataset/simple_bidding_dataset.parquet")
-    
-    total_samples = len(df)
+    pf = pq.ParquetFile("dataset/simple_bidding_dataset.parquet")
+
+    total_samples = pf.metadata.num_rows
     print(f"Total samples: {total_samples}")
-    
+
+    # Stream hand_south (the only column checked) one row group at a time,
+    # popcounting straight over the Arrow value buffers
     invalid_count = 0
-    hands = df['hand_south']
-    
-    for i, hand in enumerate(hands):
-        c = count_bits(hand)
-        if c != 8:
-            invalid_count += 1
-            if invalid_count <= 5: # Print first few errors
-                print(f"Sample {i}: Hand has {c} cards (Expected 8)")
-                
+    null_count = 0
+    reported = 0
+    start = 0
+    for rg in range(pf.num_row_groups):
+        column = pf.read_row_group(rg, columns=['hand_south']).column('hand_south')
+        for chunk in column.chunks:
+            if len(chunk) == 0:
+                continue
+            counts = count_bits(chunk_values(chunk))
+            bad_mask = counts != 8
+            if chunk.null_count:
+                null_count += chunk.null_count
+                bad_mask &= chunk.is_valid().to_numpy(zero_copy_only=False)
+            bad = np.flatnonzero(bad_mask)
+            invalid_count += len(bad)
+
+            for i in bad[:5 - reported]: # Print first few errors
+                print(f"Sample {start + i}: Hand has {counts[i]} cards (Expected 8)")
+            reported += min(len(bad), 5 - reported)
+            start += len(chunk)
+
+    invalid_count += null_count # Nulls are missing hands: invalid too
     print(f"\nFound {invalid_count} invalid hands out of {total_samples}")
+    if null_count:
+        print(f"  (of which {null_count} null)")
     print(f"Corruption rate: {invalid_count/total_samples*100:.2f}%")
 
 except Exception as e:
@@ -1,14 +1,16 @@
 
-import pandas as pd
+import pyarrow.parquet as pq
 
 try:
-    df = pd.read_parquet("dataset/simple_gameplay_dataset.parquet")
-    print("Columns:", df.columns.tolist())
+    # Only the schema and the first row are needed: don't decode the whole file
+    pf = pq.ParquetFile("dataset/simple_gameplay_dataset.parquet")
+    print("Columns:", pf.schema_arrow.names)
+    first = pf.read_row_group(0).slice(0, 1).to_pylist()[0]
     print("\nFirst row:")
-    print(df.iloc[0])
+    for col, val in first.items():
+        print(f"{col}: {val}")
     print("\nInput Shapes:")
-    for col in df.columns:
-        val = df.iloc[0][col]
+    for col, val in first.items():
         if hasattr(val, '__len__') and not isinstance(val, str):
              print(f"{col}: len={len(val)}")
         else:
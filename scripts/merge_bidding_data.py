@@ -47,19 +47,26 @@ def merge_parquet_files(filename):
             print("No .parquet files found in the source directory.")
             sys.exit(1)
 
-        # Read the dataset using the list of files
-        dataset = pq.ParquetDataset(parquet_files)
-        table = dataset.read()
-        
-        print(f"Read {table.num_rows} rows.")
-        
+        # Stream row groups from each file into the output (constant memory, no full-table concat)
         print(f"Writing merged data to {output_path}...")
-        pq.write_table(table, output_path)
+        schema = pq.ParquetFile(parquet_files[0]).schema_arrow
+        num_rows = 0
+        with pq.ParquetWriter(output_path, schema) as writer:
+            for file_path in parquet_files:
+                pf = pq.ParquetFile(file_path)
+                for rg in range(pf.num_row_groups):
+                    table = pf.read_row_group(rg)
+                    writer.write_table(table)
+                    num_rows += table.num_rows
         
+        print(f"Merged {num_rows} rows from {len(parquet_files)} files.")
         print("Success!")
         
     except Exception as e:
         print(f"Error processing parquet files: {e}")
+        # Don't leave a partial file behind (it would block the next run)
+        if os.path.exists(output_path):
+            os.remove(output_path)
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -1,23 +1,27 @@
 
 import coinche_engine
+import numpy as np
 import sys
 
-def count_bits(n):
-    return bin(n).count('1')
+def count_bits(arr):
+    # Vectorized popcount of a uint64 array
+    if hasattr(np, 'bitwise_count'): # NumPy >= 2.0
+        return np.bitwise_count(arr)
+    return np.unpackbits(arr.view(np.uint8)).reshape(len(arr), 64).sum(axis=1)
 
 try:
     print("Generating hands...")
     hands_flat, strategies = coinche_engine.generate_bidding_hands(100) # Check 100 samples
     
     # hands_flat is [h0, h1, h2, h3, h0, h1...]
-    for i in range(len(hands_flat)):
-        h = hands_flat[i]
-        c = count_bits(h)
-        if c != 8:
-            print(f"ERROR: Hand {i} has {c} cards! Expected 8.")
-            sys.exit(1)
+    counts = count_bits(np.asarray(hands_flat, dtype=np.uint64))
+    bad = np.flatnonzero(counts != 8)
+    if bad.size:
+        i = bad[0]
+        print(f"ERROR: Hand {i} has {counts[i]} cards! Expected 8.")
+        sys.exit(1)
             
-    print("SUCCESS: All 400 hands have 8 cards.")
+    print(f"SUCCESS: All {len(hands_flat)} hands have 8 cards.")
     
 except Exception as e:
     print(f"Crash: {e}")